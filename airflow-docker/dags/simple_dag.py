@@ -1,25 +1,9 @@
 from datetime import datetime, timedelta
 import pandas as pd
-from airflow import DAG
-from airflow.operators.python_operator import PythonOperator
-
-def create_dataframe():
-    data = {'Name': ['John', 'Anna', 'Peter', 'Linda'],
-            'Age': [28, 24, 35, 32]}
-    df = pd.DataFrame(data)
-    df.to_csv('/tmp/data.csv', index=False)
-    print("DataFrame created and saved to /tmp/data.csv")
-
-def process_dataframe():
-    df = pd.read_csv('/tmp/data.csv')
-    df['Age'] = df['Age'] + 1  # Example processing: increment age by 1
-    df.to_csv('/tmp/processed_data.csv', index=False)
-    print("DataFrame processed and saved to /tmp/processed_data.csv")
-
-def print_dataframe():
-    df = pd.read_csv('/tmp/processed_data.csv')
-    print("Processed DataFrame:")
-    print(df)
+from airflow.decorators import dag, task
+
+# Skip defensive copies on column assignments
+pd.options.mode.copy_on_write = True
 
 default_args = {
     'owner': 'airflow',
@@ -28,29 +12,35 @@ default_args = {
     'retry_delay': timedelta(minutes=5),
 }
 
-dag = DAG(
-    'sophisticated_dag',
+@dag(
+    dag_id='sophisticated_dag',
     default_args=default_args,
     description='A more sophisticated DAG with DataFrame operations',
     schedule_interval=timedelta(days=1),
 )
-
-create_task = PythonOperator(
-    task_id='create_dataframe',
-    python_callable=create_dataframe,
-    dag=dag,
-)
-
-process_task = PythonOperator(
-    task_id='process_dataframe',
-    python_callable=process_dataframe,
-    dag=dag,
-)
-
-print_task = PythonOperator(
-    task_id='print_dataframe',
-    python_callable=print_dataframe,
-    dag=dag,
-)
-
-create_task >> process_task >> print_task
\ No newline at end of file
+def sophisticated_dag():
+    # The frame is small, so it travels between tasks via XCom directly —
+    # no file round-trips or (de)serialization through /tmp
+
+    @task
+    def create_dataframe() -> pd.DataFrame:
+        data = {'Name': ['John', 'Anna', 'Peter', 'Linda'],
+                'Age': [28, 24, 35, 32]}
+        df = pd.DataFrame(data)
+        print("DataFrame created")
+        return df
+
+    @task
+    def process_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        df['Age'] = df['Age'] + 1  # Example processing: increment age by 1
+        print("DataFrame processed")
+        return df
+
+    @task
+    def print_dataframe(df: pd.DataFrame):
+        print("Processed DataFrame:")
+        print(df.head().to_string())
+
+    print_dataframe(process_dataframe(create_dataframe()))
+
+sophisticated_dag()
@@ -1,7 +1,9 @@
 from airflow import DAG
+from airflow.decorators import task
 from airflow.operators.dummy import DummyOperator
-from airflow.operators.python import PythonOperator
 from datetime import datetime, timedelta
+from pathlib import Path
+import pandas as pd
 from src.pipelines.etl import (
     load_json_readings,
     get_data_summary,
@@ -18,97 +20,89 @@ default_args = {
     "start_date": datetime(2023, 9, 15),
 }
 
-def extract_json():
+# Tasks exchange DataFrames through Parquet files on a shared staging path
+# and push only the file path via XCom, keeping large frames out of the
+# Airflow metadata database. The TaskFlow API passes those paths between
+# tasks as real Python objects instead of stringified Jinja pulls.
+STAGE_ROOT = '/tmp/stage'
+
+def _stage(df, dag_run_id, name):
+    stage_dir = Path(STAGE_ROOT) / dag_run_id
+    stage_dir.mkdir(parents=True, exist_ok=True)
+    path = str(stage_dir / f"{name}.parquet")
+    df.to_parquet(path, engine="pyarrow", compression="snappy")
+    return path
+
+@task
+def extract_json(dag_run_id):
     df_readings = load_json_readings()
-    return df_readings
+    return _stage(df_readings, dag_run_id, 'readings')
 
-def extract_sqlite():
+@task(pool="sqlite_pool")
+def extract_table(table_name, dag_run_id):
+    # One task (and one SQLite connection) per table: the three queries are
+    # independent, so the scheduler can overlap them
     db = DatabaseLoader()
-    df_agreement = db.load_table('agreement')
-    df_product = db.load_table('product')
-    df_meterpoint = db.load_table('meterpoint')
-    return df_agreement, df_product, df_meterpoint
+    return _stage(db.load_table(table_name), dag_run_id, table_name)
 
-def store_raw_data(df_readings, df_agreement, df_product, df_meterpoint):
+@task(pool="pg_write_pool")
+def store_raw_data(readings_path, agreement_path, product_path, meterpoint_path):
     writer = PostgresWriter()
     writer.ensure_schema_exists(writer.raw_schema)
     writer.ensure_raw_tables_exist()
-    writer.load_raw_readings(df_readings)
+    # Only materialize the columns the raw table actually stores
+    df_readings = pd.read_parquet(
+        readings_path,
+        columns=['interval_start', 'consumption_delta', 'meterpoint_id']
+    )
+    # Suspend secondary indexes for the duration of the bulk load
+    with writer.suspended_indexes('raw_meter_readings'):
+        writer.load_raw_readings(df_readings)
     reference_data = {
-        'raw_agreements': df_agreement,
-        'raw_products': df_product,
-        'raw_meterpoints': df_meterpoint
+        'raw_agreements': agreement_path,
+        'raw_products': product_path,
+        'raw_meterpoints': meterpoint_path
     }
-    for table_name, df in reference_data.items():
-        writer.load_raw_reference_data(table_name, df)
-
-def transform_data():
-    reader = PostgresReader()
-    raw_data = reader.read_raw_tables()
-    transformer = DataTransformer(
-        df_readings=raw_data['readings'],
-        df_agreement=raw_data['agreement'],
-        df_product=raw_data['product'],
-        df_meterpoint=raw_data['meterpoint']
-    )
-    df_active_agreements = transformer.get_active_agreements('2021-01-01')
-    df_halfhourly = transformer.get_halfhourly_consumption()
-    df_product_daily = transformer.get_daily_product_consumption()
-    return df_active_agreements, df_halfhourly, df_product_daily
+    for table_name, path in reference_data.items():
+        writer.load_raw_reference_data(table_name, pd.read_parquet(path))
 
-def load_analytics(df_active_agreements, df_halfhourly, df_product_daily):
+@task(pool="pg_write_pool")
+def refresh_analytics_views():
+    # The analytics tables are materialized views over the raw tables, so
+    # the whole transform runs inside Postgres — no pandas round-trip
     writer = PostgresWriter()
-    writer.ensure_schema_exists(writer.analytics_schema)
-    writer.write_active_agreements(df_active_agreements, '2021-01-01')
-    writer.write_halfhourly_consumption(df_halfhourly)
-    writer.write_daily_product_consumption(df_product_daily)
+    writer.create_analytics_views('2021-01-01')
+    writer.refresh_analytics_views()
 
+# Pools cap concurrent DB connections now that extracts run in parallel.
+# Create them once with:
+#   airflow pools set sqlite_pool 2 "sqlite extracts"
+#   airflow pools set pg_write_pool 2 "pg bulk writes"
 with DAG(
     dag_id="meter_readings_etl_optimized",
     default_args=default_args,
     schedule_interval="@daily",
     catchup=False,
+    max_active_tasks=8,
 ) as dag:
 
     start = DummyOperator(task_id="start")
+    end = DummyOperator(task_id="end")
 
-    extract_json_task = PythonOperator(
-        task_id="extract_json",
-        python_callable=extract_json
-    )
-
-    extract_sqlite_task = PythonOperator(
-        task_id="extract_sqlite",
-        python_callable=extract_sqlite
-    )
-
-    store_raw_data_task = PythonOperator(
-        task_id="store_raw_data",
-        python_callable=store_raw_data,
-        op_args=[
-            "{{ task_instance.xcom_pull(task_ids='extract_json') }}",
-            "{{ task_instance.xcom_pull(task_ids='extract_sqlite')[0] }}",
-            "{{ task_instance.xcom_pull(task_ids='extract_sqlite')[1] }}",
-            "{{ task_instance.xcom_pull(task_ids='extract_sqlite')[2] }}"
-        ]
-    )
-
-    transform_data_task = PythonOperator(
-        task_id="transform_data",
-        python_callable=transform_data
-    )
+    readings_path = extract_json("{{ run_id }}")
+    reference_paths = {
+        table: extract_table.override(task_id=f"extract_{table}")(table, "{{ run_id }}")
+        for table in ('agreement', 'product', 'meterpoint')
+    }
 
-    load_analytics_task = PythonOperator(
-        task_id="load_analytics",
-        python_callable=load_analytics,
-        op_args=[
-            "{{ task_instance.xcom_pull(task_ids='transform_data')[0] }}",
-            "{{ task_instance.xcom_pull(task_ids='transform_data')[1] }}",
-            "{{ task_instance.xcom_pull(task_ids='transform_data')[2] }}"
-        ]
+    stored = store_raw_data(
+        readings_path,
+        reference_paths['agreement'],
+        reference_paths['product'],
+        reference_paths['meterpoint']
     )
 
-    end = DummyOperator(task_id="end")
+    refreshed = refresh_analytics_views()
 
-    start >> [extract_json_task, extract_sqlite_task] >> store_raw_data_task
-    store_raw_data_task >> transform_data_task >> load_analytics_task >> end
+    start >> [readings_path, *reference_paths.values()]
+    stored >> refreshed >> end
@@ -3,32 +3,29 @@ Playground for analysts to query transformed data from PostgreSQL database.
 """
 
 import os
+import sys
+from pathlib import Path
+
 import pandas as pd
-from sqlalchemy import create_engine, text
-from dotenv import load_dotenv
 
-def get_db_connection():
-    """Create database connection using environment variables."""
-    load_dotenv()
-    
-    connection_string = (
-        f"postgresql://{os.getenv('PGUSER')}:{os.getenv('PGPASSWORD')}"
-        f"@{os.getenv('PGHOST')}/{os.getenv('PGDATABASE')}?sslmode=require"
-    )
-    return create_engine(connection_string)
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.db import engine
 
 def run_query(query: str) -> pd.DataFrame:
     """
     Execute a SQL query and return results as a DataFrame.
-    
+
     Args:
         query: SQL query string
-    
+
     Returns:
         DataFrame containing query results
     """
-    engine = get_db_connection()
-    return pd.read_sql_query(query, engine)
+    return pd.read_sql_query(query, engine())
 
 def main():
     """Run example queries on the transformed data."""
@@ -11,8 +11,11 @@ project_root = str(Path(__file__).parent.parent)
 if project_root not in sys.path:
     sys.path.append(project_root)
 
+from concurrent.futures import ThreadPoolExecutor
+
 from src.extraction import DatabaseLoader
 import pandas as pd
+from sqlalchemy import create_engine
 
 # Configure pandas display options
 pd.set_option('display.max_columns', None)
@@ -42,21 +45,36 @@ def explore_database():
             nullable_str = 'NULL' if column.get('nullable', True) else 'NOT NULL'
             print(f"  - {column['name']:<20} {str(column['type']):<15} {nullable_str}")
     
-    # 3. Show sample data from each table
+    # 3. Get all row counts in one round-trip instead of one query per table
+    counts_sql = ' UNION ALL '.join(
+        f"SELECT '{table}' AS table_name, COUNT(*) AS count FROM {table}"
+        for table in tables
+    )
+    df_counts = pd.read_sql_query(counts_sql, db.engine)
+    row_counts = dict(zip(df_counts['table_name'], df_counts['count']))
+
+    # 4. Fetch the samples concurrently; each worker opens its own engine
+    # since SQLite connections aren't shareable across threads
+    def _sample(table: str) -> pd.DataFrame:
+        engine = create_engine(f"sqlite:///{db.db_path}")
+        try:
+            return pd.read_sql_query(f"SELECT * FROM {table} LIMIT 5", engine)
+        finally:
+            engine.dispose()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        samples = dict(zip(tables, executor.map(_sample, tables)))
+
     print("\n=== Sample Data ===")
     for table in tables:
         print(f"\nTable: {table}")
         print("-" * (len(table) + 7))
-        
-        # Load first 5 rows from each table
-        df = pd.read_sql_query(f"SELECT * FROM {table} LIMIT 5", db.engine)
-        print(df)
-        
+        print(samples[table])
+
         # Display row count
-        count = pd.read_sql_query(f"SELECT COUNT(*) as count FROM {table}", db.engine)
-        print(f"\nTotal rows: {count['count'].iloc[0]:,}")
+        print(f"\nTotal rows: {row_counts[table]:,}")
     
-    # 4. Show relationships (foreign keys)
+    # 5. Show relationships (foreign keys)
     print("\n=== Table Relationships ===")
     relationships = {
         'agreement': {
@@ -3,13 +3,32 @@ Streamlit app for visualizing transformed data from PostgreSQL database.
 """
 
 import os
+import sys
+from datetime import date
+from pathlib import Path
+
 import pandas as pd
 import streamlit as st
 import plotly.express as px
-from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from dotenv import load_dotenv
 
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.db import engine
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:  # pyarrow is optional; fall back to querying Postgres
+    ds = None
+
+# Day-partitioned Parquet export of analytics.halfhourly_consumption,
+# produced by PostgresWriter.export_halfhourly_parquet
+HALFHOURLY_DATASET = os.getenv('HALFHOURLY_DATASET', 'data/analytics/halfhourly')
+
 # Page config
 st.set_page_config(
     page_title="Energy Data Analytics",
@@ -20,20 +39,51 @@ st.set_page_config(
 # Load environment variables
 load_dotenv()
 
+@st.cache_resource
 def get_db_connection() -> Engine:
-    """Create database connection using environment variables."""
-    connection_string = (
-        f"postgresql+psycopg2://{os.getenv('PGUSER')}:{os.getenv('PGPASSWORD')}"
-        f"@{os.getenv('PGHOST')}/{os.getenv('PGDATABASE')}?sslmode=require"
-    )
-    return create_engine(connection_string)
+    """Return the shared database engine, persisted across script reruns.
+
+    The engine itself comes from src.db so the app and the analyst scripts
+    share one pool configuration; Streamlit's resource cache keeps it (and
+    its connections) alive across reruns.
+    """
+    return engine()
 
+@st.cache_data(ttl=300, show_spinner=False)
 def run_query(query: str) -> pd.DataFrame:
-    """Execute a SQL query and return results as a DataFrame."""
+    """Execute a SQL query and return results as a DataFrame.
+
+    Results are cached for five minutes so widget interactions don't
+    re-run every query against the warehouse.
+    """
     engine = get_db_connection()
     with engine.connect() as connection:
         return pd.read_sql_query(query, con=connection)
 
+@st.cache_data(ttl=300, show_spinner=False)
+def load_halfhourly_slice(start_date: str, end_date: str) -> pd.DataFrame:
+    """Load a date-range slice of the half-hourly consumption fact table.
+
+    Prefers the local Parquet dataset: the date filter is pushed into the
+    Arrow scanner, so only the partitions inside the range are read. Falls
+    back to a range-filtered Postgres query.
+    """
+    if ds is not None and os.path.isdir(HALFHOURLY_DATASET):
+        dataset = ds.dataset(HALFHOURLY_DATASET, partitioning='hive')
+        table = dataset.to_table(
+            filter=(ds.field('date') >= start_date) & (ds.field('date') <= end_date),
+            columns=['datetime', 'meterpoint_count', 'total_consumption_kwh']
+        )
+        return table.to_pandas()
+
+    schema = os.getenv('ANALYTICS_SCHEMA', 'dev')
+    query = f"""
+    SELECT datetime, meterpoint_count, total_consumption_kwh
+    FROM {schema}.halfhourly_consumption
+    WHERE datetime >= '{start_date}' AND datetime < DATE '{end_date}' + 1
+    """
+    return run_query(query)
+
 def main():
     """Main Streamlit app."""
     st.title("⚡ Energy Data Analytics Dashboard")
@@ -93,18 +143,23 @@ def main():
         
     elif page == "Consumption Analysis":
         st.header("Consumption Analysis")
-        
-        # Get consumption data
-        query = f"""
-        SELECT 
-            datetime,
-            meterpoint_count,
-            total_consumption_kwh
-        FROM {schema}.halfhourly_consumption
-        ORDER BY datetime
-        """
-        df_consumption = run_query(query)
-        
+
+        # A bounded date range keeps the scan to a handful of partitions
+        # instead of the whole fact table
+        start_date = st.sidebar.date_input("Start date", value=date(2021, 1, 1))
+        end_date = st.sidebar.date_input("End date", value=date(2021, 1, 31))
+        df_slice = load_halfhourly_slice(str(start_date), str(end_date))
+
+        # Aggregate to hours: the line chart doesn't need half-hourly
+        # resolution, and the slice is small enough to resample locally
+        df_consumption = (
+            df_slice
+            .set_index('datetime')['total_consumption_kwh']
+            .resample('h')
+            .sum()
+            .reset_index()
+        )
+
         # Time series plot
         st.subheader("Consumption Over Time")
         fig = px.line(
@@ -114,18 +169,17 @@ def main():
             title='Total Energy Consumption Over Time'
         )
         st.plotly_chart(fig, use_container_width=True)
-        
+
         # Hourly patterns
-        query = f"""
-        SELECT 
-            EXTRACT(HOUR FROM datetime) as hour_of_day,
-            AVG(total_consumption_kwh) as avg_consumption,
-            AVG(meterpoint_count) as avg_active_meters
-        FROM {schema}.halfhourly_consumption
-        GROUP BY EXTRACT(HOUR FROM datetime)
-        ORDER BY hour_of_day
-        """
-        df_hourly = run_query(query)
+        df_hourly = (
+            df_slice
+            .assign(hour_of_day=df_slice['datetime'].dt.hour)
+            .groupby('hour_of_day', as_index=False)
+            .agg(
+                avg_consumption=('total_consumption_kwh', 'mean'),
+                avg_active_meters=('meterpoint_count', 'mean')
+            )
+        )
         
         col1, col2 = st.columns(2)
         
@@ -164,12 +218,19 @@ def main():
         """
         df_products = run_query(query)
         
-        # Product summary
+        # Product summary, aggregated in SQL rather than client-side pandas
         st.subheader("Product Performance Summary")
-        product_summary = df_products.groupby('product_display_name').agg({
-            'total_consumption_kwh': ['sum', 'mean'],
-            'meterpoint_count': 'mean'
-        }).round(2)
+        summary_query = f"""
+        SELECT
+            product_display_name,
+            ROUND(SUM(total_consumption_kwh)::numeric, 2) as total_consumption_kwh,
+            ROUND(AVG(total_consumption_kwh)::numeric, 2) as avg_consumption_kwh,
+            ROUND(AVG(meterpoint_count)::numeric, 2) as avg_meterpoint_count
+        FROM {schema}.daily_product_consumption
+        GROUP BY product_display_name
+        ORDER BY total_consumption_kwh DESC
+        """
+        product_summary = run_query(summary_query)
         st.dataframe(product_summary, use_container_width=True)
         
         # Product comparison chart
@@ -0,0 +1,10 @@
+"""
+Shared database engine module for analyst tooling.
+
+This module provides a single cached SQLAlchemy engine so scripts and the
+Streamlit app share one connection pool instead of each building their own.
+"""
+
+from .engine import engine
+
+__all__ = ['engine']
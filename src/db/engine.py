@@ -0,0 +1,44 @@
+"""
+Shared PostgreSQL engine for analyst-facing tooling.
+"""
+
+import os
+import logging
+from functools import lru_cache
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def engine() -> Engine:
+    """Create (once) and reuse the analytics database engine.
+
+    Memoizing keeps a single connection pool alive for the process, and
+    centralizing construction means pool and executemany tuning applies
+    uniformly to every caller:
+
+    - pool_pre_ping revalidates pooled connections after idle periods
+    - executemany_mode='values_plus_batch' batches any remaining
+      to_sql/executemany calls through psycopg2's fast path
+
+    Returns:
+        The shared SQLAlchemy engine
+    """
+    load_dotenv()
+
+    connection_string = (
+        f"postgresql://{os.getenv('PGUSER')}:{os.getenv('PGPASSWORD')}"
+        f"@{os.getenv('PGHOST')}/{os.getenv('PGDATABASE')}?sslmode=require"
+    )
+    logger.debug("Creating shared analytics engine")
+    return create_engine(
+        connection_string,
+        pool_size=4,
+        pool_pre_ping=True,
+        executemany_mode='values_plus_batch',
+        executemany_values_page_size=10_000
+    )
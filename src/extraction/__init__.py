@@ -6,7 +6,7 @@ and accessing data from the SQLite database.
 """
 
 from .db_loader import DatabaseLoader
-from .json_loader import load_json_readings, get_data_summary
+from .json_loader import load_json_readings, iter_reading_batches, get_data_summary
 
 # Default paths
 DEFAULT_DB_PATH = 'data/case_study.db'
@@ -15,6 +15,7 @@ DEFAULT_READINGS_PATH = 'data/readings'
 __all__ = [
     'DatabaseLoader',
     'load_json_readings',
+    'iter_reading_batches',
     'get_data_summary',
     'DEFAULT_DB_PATH',
     'DEFAULT_READINGS_PATH'
@@ -7,9 +7,14 @@ from pathlib import Path
 from typing import Optional, List, Dict
 
 import pandas as pd
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.engine import Engine
 
+try:
+    import connectorx as cx
+except ImportError:  # connectorx is optional; fall back to pandas read_sql
+    cx = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -35,7 +40,9 @@ class DatabaseLoader:
             
         self.db_path: Path = Path(db_path).resolve()
         self._engine: Optional[Engine] = None
-        
+        self._inspector = None
+        self._schema_cache: Dict[str, List[Dict]] = {}
+
         logger.debug(f"Initialized DatabaseLoader with db_path={self.db_path}")
         
     @property
@@ -46,38 +53,221 @@ class DatabaseLoader:
                 raise FileNotFoundError(f"Database file not found: {self.db_path}")
             
             connection_string = f"sqlite:///{self.db_path}"
-            self._engine = create_engine(connection_string)
+            # Stream result rows instead of buffering whole result sets in
+            # the DBAPI cursor before pandas ever sees them
+            self._engine = create_engine(
+                connection_string,
+                execution_options={'stream_results': True}
+            )
+
+            # Tune each new SQLite connection for the read-heavy workload:
+            # mmap gives zero-copy page access, the larger cache keeps the
+            # working set resident, and WAL/NORMAL drop journal overhead
+            @event.listens_for(self._engine, 'connect')
+            def _tune_sqlite(dbapi_conn, _connection_record):
+                cursor = dbapi_conn.cursor()
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA synchronous=NORMAL')
+                cursor.execute('PRAGMA mmap_size=268435456')  # 256 MB
+                cursor.execute('PRAGMA cache_size=-262144')   # 256 MB
+                cursor.execute('PRAGMA temp_store=MEMORY')
+                cursor.close()
+
             logger.info(f"Connected to database: {self.db_path}")
-        
+            self.ensure_indexes()
+
         return self._engine
-    
+
+    def ensure_indexes(self) -> None:
+        """
+        Create lookup indexes on the agreement table if they don't exist.
+
+        Date-range and foreign-key filters on agreement otherwise full-scan
+        the table on every query; ANALYZE refreshes the statistics so the
+        planner actually uses the indexes.
+        """
+        statements = (
+            "CREATE INDEX IF NOT EXISTS ix_agreement_dates "
+            "ON agreement(agreement_valid_from, agreement_valid_to)",
+            "CREATE INDEX IF NOT EXISTS ix_agreement_meterpoint "
+            "ON agreement(meterpoint_id)",
+            "CREATE INDEX IF NOT EXISTS ix_agreement_product "
+            "ON agreement(product_id)",
+            # Covering index: meterpoint history queries resolve from the
+            # index alone without touching the agreement table
+            "CREATE INDEX IF NOT EXISTS ix_agreement_mp_cover "
+            "ON agreement(meterpoint_id, agreement_valid_from, "
+            "agreement_valid_to, product_id, agreement_id)",
+            "CREATE INDEX IF NOT EXISTS ix_product_product_id "
+            "ON product(product_id)",
+            "CREATE INDEX IF NOT EXISTS ix_meterpoint_id "
+            "ON meterpoint(meterpoint_id)",
+            "ANALYZE",
+        )
+        try:
+            with self._engine.connect() as conn:
+                for statement in statements:
+                    conn.execute(text(statement))
+                conn.commit()
+            logger.debug("Agreement indexes created or verified")
+        except Exception as e:
+            # A read-only database file still works, just without the indexes
+            logger.warning(f"Could not create agreement indexes: {e}")
+
+    @property
+    def inspector(self):
+        """Lazy loading of the SQLAlchemy inspector."""
+        if self._inspector is None:
+            self._inspector = inspect(self.engine)
+        return self._inspector
+
     def get_table_schema(self, table_name: str) -> List[Dict]:
         """
         Get the schema information for a table.
-        
+
+        Results are cached: the schema doesn't change mid-run, and each
+        lookup otherwise re-scans pragma_table_info.
+
         Args:
             table_name: Name of the table
-            
+
         Returns:
             List of dictionaries containing column information
         """
-        inspector = inspect(self.engine)
-        return inspector.get_columns(table_name)
-    
+        if table_name not in self._schema_cache:
+            self._schema_cache[table_name] = self.inspector.get_columns(table_name)
+        return self._schema_cache[table_name]
+
     def get_table_names(self) -> List[str]:
-        """Get all table names from the database."""
-        query = "SELECT name FROM sqlite_master WHERE type='table'"
+        """Get all table names from the database.
+
+        SQLite's internal tables (sqlite_stat1 from the ANALYZE in
+        ensure_indexes, sqlite_sequence, ...) are excluded.
+        """
+        query = (
+            "SELECT name FROM sqlite_master "
+            "WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+        )
         return pd.read_sql_query(query, self.engine)['name'].tolist()
+
+    def get_meterpoint_history(self, meterpoint_id: str) -> pd.DataFrame:
+        """
+        Load the agreement history for one meterpoint with product details.
+
+        With the covering index in place this is an index-only scan on
+        agreement plus two indexed lookups, not a full-table join.
+
+        Args:
+            meterpoint_id: Meterpoint to look up
+
+        Returns:
+            DataFrame with one row per agreement, ordered by validity start
+        """
+        query = """
+            SELECT a.agreement_id,
+                   a.agreement_valid_from,
+                   a.agreement_valid_to,
+                   p.display_name,
+                   p.is_variable,
+                   m.region
+            FROM agreement a
+            LEFT JOIN product p ON p.product_id = a.product_id
+            LEFT JOIN meterpoint m ON m.meterpoint_id = a.meterpoint_id
+            WHERE a.meterpoint_id = :meterpoint_id
+            ORDER BY a.agreement_valid_from
+        """
+        return pd.read_sql_query(
+            text(query), self.engine, params={'meterpoint_id': meterpoint_id}
+        )
+
+    def get_database_summary(self) -> Dict[str, int]:
+        """
+        Get row counts for every table in a single round-trip.
+
+        Returns:
+            Dictionary mapping table name to row count
+        """
+        tables = self.get_table_names()
+        if not tables:
+            return {}
+
+        # One UNION ALL statement instead of one COUNT(*) query per table
+        query = ' UNION ALL '.join(
+            f"SELECT '{table}' AS table_name, COUNT(*) AS row_count FROM {table}"
+            for table in tables
+        )
+        df = pd.read_sql_query(query, self.engine)
+        return dict(zip(df['table_name'], df['row_count']))
     
-    def load_table(self, table_name: str) -> pd.DataFrame:
+    @property
+    def uri(self) -> str:
+        """Database connection URI."""
+        return f"sqlite://{self.db_path}"
+
+    def load_table(self, table_name: str,
+                   since: Optional[str] = None,
+                   since_column: str = 'agreement_valid_from') -> pd.DataFrame:
         """
-        Load a complete table from the database.
-        
+        Load a table from the database, optionally filtered incrementally.
+
         Args:
             table_name: Name of the table to load
-            
+            since: Optional cutoff value; only rows where since_column is
+                   greater are returned. Pushing the predicate into SQLite
+                   avoids transferring rows a previous run already loaded.
+            since_column: Column the cutoff applies to
+
         Returns:
             DataFrame containing the table data
         """
         logger.info(f"Loading table: {table_name}")
-        return pd.read_sql_table(table_name, self.engine) 
\ No newline at end of file
+
+        query = f"SELECT * FROM {table_name}"
+        if since is not None:
+            query += f" WHERE {since_column} > '{since}'"
+
+        # connectorx parses rows straight into Arrow buffers, skipping
+        # SQLAlchemy's row-by-row cursor path
+        if cx is not None:
+            table = cx.read_sql(self.uri, query, return_type='arrow')
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+        # Chunked fetch keeps peak memory at one chunk of row tuples rather
+        # than the whole table's worth before DataFrame conversion
+        if since is not None:
+            chunks = pd.read_sql_query(query, self.engine, chunksize=50_000)
+        else:
+            chunks = pd.read_sql_table(table_name, self.engine, chunksize=50_000)
+        chunks = list(chunks)
+        if not chunks:
+            return pd.DataFrame()
+        df = pd.concat(chunks, ignore_index=True)
+
+        # Dictionary-encode the repeated string columns; they are join and
+        # groupby keys downstream, where category codes hash faster
+        for column in ('meterpoint_id', 'display_name', 'region'):
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        return self._shrink(df)
+
+    @staticmethod
+    def _shrink(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Downcast numeric columns to the smallest dtype that holds them.
+
+        pandas defaults every numeric read to int64/float64; halving the
+        width halves the memory traffic of the downstream merges.
+
+        Args:
+            df: DataFrame to downcast in place
+
+        Returns:
+            The same DataFrame with narrowed numeric columns
+        """
+        for column in df.columns:
+            dtype = df[column].dtype
+            if dtype == 'float64':
+                df[column] = pd.to_numeric(df[column], downcast='float')
+            elif pd.api.types.is_integer_dtype(dtype):
+                df[column] = pd.to_numeric(df[column], downcast='integer')
+        return df 
\ No newline at end of file
@@ -2,21 +2,63 @@
 Module for loading both raw and transformed data into PostgreSQL database.
 """
 
+import csv
 import os
 import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Set
 from datetime import datetime
 from io import StringIO
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, inspect, text, MetaData, Table, Column, DateTime, String, Float, Integer
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, func, inspect, text, MetaData, Table, Column, DateTime, String, Float, Integer, PrimaryKeyConstraint
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.dialects.postgresql import insert
 from dotenv import load_dotenv
 
+try:
+    from pgcopy import CopyManager
+except ImportError:  # pgcopy is optional; fall back to text COPY
+    CopyManager = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only needed for Parquet export
+    pa = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+def psql_insert_copy(table, conn, keys, data_iter) -> None:
+    """
+    to_sql method callable that inserts each chunk via COPY FROM STDIN.
+
+    Passing this as method= keeps SQLAlchemy's schema handling while
+    replacing the default per-row INSERT path with one COPY per chunk.
+
+    Args:
+        table: pandas SQLTable being written
+        conn: SQLAlchemy connection
+        keys: Column names
+        data_iter: Iterable of row tuples
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(data_iter)
+    buffer.seek(0)
+
+    target = f'{table.schema}.{table.name}' if table.schema else table.name
+    with conn.connection.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {target} ({','.join(keys)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+
 class PostgresWriter:
     """Class to handle writing both raw and transformed data to PostgreSQL database."""
     
@@ -45,7 +87,9 @@ class PostgresWriter:
         self._engine: Optional[Engine] = None
         self._metadata: Optional[MetaData] = None
         self._inspector: Optional[inspect] = None
-        self._existing_schemas: Optional[Set[str]] = None
+        self._ensured_schemas: Set[str] = set()
+        self._table_names: Dict[str, Set[str]] = {}
+        self._session_conn: Optional[Connection] = None
         
         logger.debug(f"Initialized PostgresWriter with schemas: raw={self.raw_schema}, analytics={self.analytics_schema}")
     
@@ -57,7 +101,26 @@ class PostgresWriter:
                 f"postgresql://{self.db_params['user']}:{self.db_params['password']}"
                 f"@{self.db_params['host']}/{self.db_params['database']}?sslmode=require"
             )
-            self._engine = create_engine(connection_string)
+            # Fold any remaining executemany into multi-VALUES / batched
+            # statements on psycopg2's fast path instead of one round-trip
+            # per row
+            # LIFO checkout reuses the most recently used (warmest)
+            # connection and lets the rest of the pool age out; recycle
+            # guards against the SSL link idling out server-side
+            self._engine = create_engine(
+                connection_string,
+                # Set search_path once per connection instead of per call
+                connect_args={
+                    'options': f'-c search_path={self.raw_schema},{self.analytics_schema}'
+                },
+                pool_use_lifo=True,
+                pool_size=10,
+                max_overflow=5,
+                pool_recycle=300,
+                executemany_mode='values_plus_batch',
+                executemany_values_page_size=10_000,
+                executemany_batch_page_size=1_000
+            )
             logger.info(f"Connected to PostgreSQL database: {self.db_params['database']}")
         
         return self._engine
@@ -76,26 +139,64 @@ class PostgresWriter:
             self._inspector = inspect(self.engine)
         return self._inspector
 
-    @property
-    def existing_schemas(self) -> Set[str]:
-        """Get existing schemas in the database."""
-        if self._existing_schemas is None:
-            query = text("SELECT schema_name FROM information_schema.schemata")
+    @contextmanager
+    def session(self):
+        """
+        Share one pooled connection across grouped writer calls.
+
+        The setup methods (ensure_schema_exists, ensure_raw_tables_exist,
+        get_latest_reading_timestamp) each check out a connection when
+        called alone; inside a session block they all reuse the one held
+        here, collapsing several pool checkouts into a single one. The
+        bulk COPY loads keep their own connections — they set session
+        state and may run in parallel.
+        """
+        if self._session_conn is not None:
+            # Nested use: keep the outer session's connection
+            yield self._session_conn
+            return
+        with self.engine.connect() as conn:
+            self._session_conn = conn
+            try:
+                yield conn
+            finally:
+                self._session_conn = None
+
+    @contextmanager
+    def _connection(self):
+        """Yield the session connection if one is active, else a fresh one."""
+        if self._session_conn is not None:
+            yield self._session_conn
+        else:
             with self.engine.connect() as conn:
-                result = conn.execute(query)
-                self._existing_schemas = {row[0] for row in result}
-        return self._existing_schemas
+                yield conn
+
+    def _tables(self, schema: str) -> Set[str]:
+        """Cached table names for a schema.
+
+        The set is mutated in place after DDL in this class, so repeated
+        existence checks don't re-scan information_schema.
+        """
+        if schema not in self._table_names:
+            self._table_names[schema] = set(
+                self.inspector.get_table_names(schema=schema)
+            )
+        return self._table_names[schema]
 
     def ensure_schema_exists(self, schema_name: str) -> None:
-        """Create schema if it doesn't exist."""
-        if schema_name not in self.existing_schemas:
-            with self.engine.connect() as conn:
-                conn.execute(text(f"CREATE SCHEMA {schema_name};"))
-                conn.commit()
-                self._existing_schemas.add(schema_name)
-                logger.info(f"Created schema: {schema_name}")
-        else:
-            logger.debug(f"Schema already exists: {schema_name}")
+        """Create schema if it doesn't exist.
+
+        CREATE SCHEMA IF NOT EXISTS is idempotent, so one statement replaces
+        the old existence query + conditional create; the memo set keeps
+        repeat calls within a run from issuing any round-trip at all.
+        """
+        if schema_name in self._ensured_schemas:
+            return
+        with self._connection() as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema_name};"))
+            conn.commit()
+        self._ensured_schemas.add(schema_name)
+        logger.debug(f"Schema created or verified: {schema_name}")
 
     def create_schemas(self) -> None:
         """Create raw_data and analytics schemas if they don't exist."""
@@ -110,7 +211,7 @@ class PostgresWriter:
     def ensure_raw_tables_exist(self) -> None:
         """Create raw tables if they don't exist."""
         # Check if tables already exist
-        existing_tables = self.inspector.get_table_names(schema=self.raw_schema)
+        existing_tables = self._tables(self.raw_schema)
         
         # Define raw_meter_readings table if it doesn't exist
         if 'raw_meter_readings' not in existing_tables:
@@ -118,11 +219,12 @@ class PostgresWriter:
                 Column('interval_start', DateTime, nullable=False),
                 Column('consumption_delta', Float, nullable=False),
                 Column('meterpoint_id', String, nullable=False),
-                Column('loaded_at', DateTime, default=datetime.now),
+                Column('loaded_at', DateTime, server_default=func.now(), nullable=False),
+                # Composite primary key; the ON CONFLICT merge in
+                # load_raw_readings infers on these columns
+                PrimaryKeyConstraint('meterpoint_id', 'interval_start'),
                 schema=self.raw_schema,
-                extend_existing=True,
-                # Add composite primary key
-                primary_key=['meterpoint_id', 'interval_start']
+                extend_existing=True
             )
         
         # Define raw_agreements table if it doesn't exist
@@ -134,7 +236,7 @@ class PostgresWriter:
                 Column('product_id', String, nullable=False),
                 Column('meterpoint_id', String, nullable=False),
                 Column('account_id', String, nullable=False),
-                Column('loaded_at', DateTime, default=datetime.now),
+                Column('loaded_at', DateTime, server_default=func.now(), nullable=False),
                 schema=self.raw_schema,
                 extend_existing=True
             )
@@ -146,7 +248,7 @@ class PostgresWriter:
                 Column('is_variable', Integer, nullable=False),
                 Column('id', Integer, primary_key=True),
                 Column('product_id', String, nullable=False),
-                Column('loaded_at', DateTime, default=datetime.now),
+                Column('loaded_at', DateTime, server_default=func.now(), nullable=False),
                 schema=self.raw_schema,
                 extend_existing=True
             )
@@ -156,19 +258,77 @@ class PostgresWriter:
             Table('raw_meterpoints', self.metadata,
                 Column('region', String, nullable=False),
                 Column('meterpoint_id', String, primary_key=True),
-                Column('loaded_at', DateTime, default=datetime.now),
+                Column('loaded_at', DateTime, server_default=func.now(), nullable=False),
                 schema=self.raw_schema,
                 extend_existing=True
             )
         
         # Create all tables
-        self.metadata.create_all(self.engine)
+        with self._connection() as conn:
+            self.metadata.create_all(conn)
+            conn.commit()
+        existing_tables.update(
+            ('raw_meter_readings', 'raw_agreements', 'raw_products', 'raw_meterpoints')
+        )
         logger.info("Raw data tables created or verified")
 
+    @contextmanager
+    def suspended_indexes(self, table_name: str, schema: Optional[str] = None):
+        """
+        Drop a table's secondary indexes for the duration of a bulk load.
+
+        Each COPY row otherwise pays index maintenance; dropping the indexes
+        up front and rebuilding them in parallel afterwards is considerably
+        faster at scale. The primary key is left in place.
+
+        Args:
+            table_name: Table whose indexes should be suspended
+            schema: Schema of the table. Defaults to the raw schema.
+        """
+        schema = schema or self.raw_schema
+
+        index_query = text("""
+            SELECT i.indexname, i.indexdef
+            FROM pg_indexes i
+            JOIN pg_namespace n ON n.nspname = i.schemaname
+            JOIN pg_class c ON c.relname = i.indexname
+                           AND c.relnamespace = n.oid
+            JOIN pg_index x ON x.indexrelid = c.oid
+            WHERE i.schemaname = :schema
+              AND i.tablename = :table
+              AND NOT x.indisprimary
+        """)
+        with self.engine.connect() as conn:
+            indexes = conn.execute(
+                index_query, {'schema': schema, 'table': table_name}
+            ).fetchall()
+
+        if indexes:
+            with self.engine.connect() as conn:
+                for index_name, _ in indexes:
+                    conn.execute(text(f'DROP INDEX {schema}.{index_name}'))
+                conn.commit()
+            logger.info(f"Dropped {len(indexes)} indexes on {schema}.{table_name}")
+
+        try:
+            yield
+        finally:
+            if indexes:
+                def _recreate(indexdef: str) -> None:
+                    with self.engine.connect() as conn:
+                        conn.execute(text("SET maintenance_work_mem = '512MB'"))
+                        conn.execute(text(indexdef))
+                        conn.commit()
+
+                # Rebuild the saved index definitions in parallel
+                with ThreadPoolExecutor(max_workers=len(indexes)) as executor:
+                    list(executor.map(_recreate, [indexdef for _, indexdef in indexes]))
+                logger.info(f"Recreated {len(indexes)} indexes on {schema}.{table_name}")
+
     def get_latest_reading_timestamp(self) -> Optional[datetime]:
         """Get the latest timestamp from raw_meter_readings."""
         # First check if table exists
-        if 'raw_meter_readings' not in self.inspector.get_table_names(schema=self.raw_schema):
+        if 'raw_meter_readings' not in self._tables(self.raw_schema):
             logger.debug("raw_meter_readings table does not exist yet")
             return None
             
@@ -178,97 +338,315 @@ class PostgresWriter:
             FROM {self.raw_schema}.raw_meter_readings
         """)
         try:
-            with self.engine.connect() as conn:
+            with self._connection() as conn:
                 result = conn.execute(query).scalar()
             return result
         except Exception as e:
             logger.debug(f"Error getting latest timestamp: {e}")
             return None
 
-    def load_raw_readings(self, df: pd.DataFrame) -> None:
-        """Load raw meter readings into PostgreSQL."""
+    def load_raw_readings(self, df: pd.DataFrame, chunk_size: int = 100_000) -> None:
+        """
+        Load raw meter readings into PostgreSQL.
+
+        Rows are COPY'd into an unlogged staging table and merged with
+        INSERT ... ON CONFLICT DO NOTHING, so rows a previous run already
+        stored are deduped by an index probe in Postgres rather than a
+        client-side timestamp filter — re-sending overlap is harmless and
+        correctness no longer hinges on the incremental cutoff being exact.
+
+        Args:
+            df: DataFrame containing meter readings
+            chunk_size: Number of rows streamed per COPY batch. Chunking keeps
+                        memory bounded for readings sets that are too large to
+                        serialize into a single in-memory buffer.
+        """
         try:
-            # Ensure schema exists
-            self.ensure_schema_exists(self.raw_schema)
-            
-            # Create table if not exists
-            create_table_sql = f"""
-            CREATE TABLE IF NOT EXISTS {self.raw_schema}.raw_meter_readings (
-                interval_start TIMESTAMP NOT NULL,
-                consumption_delta FLOAT NOT NULL,
-                meterpoint_id TEXT NOT NULL,
-                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (meterpoint_id, interval_start)
-            );
-            """
-            
-            # Execute table creation in a separate connection
-            with self.engine.connect() as conn:
-                conn.execute(text(create_table_sql))
-                conn.commit()
-                logger.info(f"Ensured table {self.raw_schema}.raw_meter_readings exists")
-            
-            # Add loaded_at timestamp
-            df['loaded_at'] = datetime.now()
-            
-            # Use copy_from for efficient bulk loading
-            output = StringIO()
-            df[['interval_start', 'consumption_delta', 'meterpoint_id', 'loaded_at']].to_csv(
-                output, 
-                sep='\t', 
-                header=False, 
-                index=False,
-                date_format='%Y-%m-%d %H:%M:%S'  # Ensure proper datetime format
+            # Table creation lives in ensure_raw_tables_exist; re-issuing
+            # the DDL here on every load was a wasted round-trip when the
+            # pipeline has already run the setup step
+            if 'raw_meter_readings' not in self._tables(self.raw_schema):
+                self.ensure_schema_exists(self.raw_schema)
+                self.ensure_raw_tables_exist()
+
+            staging = self._prepare_readings_staging()
+
+            # loaded_at is filled by the server-side DEFAULT — no
+            # full-length timestamp column to allocate or ship
+
+            # Prefer binary COPY when pgcopy is available: it skips ASCII
+            # formatting/parsing of floats and timestamps entirely
+            if CopyManager is not None:
+                self.binary_copy_readings(df, table_name=staging)
+            else:
+                columns = ['interval_start', 'consumption_delta', 'meterpoint_id']
+                copy_sql = (
+                    f"COPY {self.raw_schema}.{staging} ({','.join(columns)}) "
+                    f"FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t')"
+                )
+
+                # Stream the frame in bounded chunks within a single transaction
+                raw_conn = self.engine.raw_connection()
+                try:
+                    with raw_conn.cursor() as cur:
+                        # Raw loads are re-runnable, so don't wait for WAL
+                        # flushes on commit
+                        cur.execute("SET synchronous_commit = off")
+                        for start in range(0, len(df), chunk_size):
+                            buffer = StringIO()
+                            df.iloc[start:start + chunk_size][columns].to_csv(
+                                buffer,
+                                sep='\t',
+                                header=False,
+                                index=False,
+                                date_format='%Y-%m-%d %H:%M:%S'  # Ensure proper datetime format
+                            )
+                            buffer.seek(0)
+                            cur.copy_expert(copy_sql, buffer)
+                    raw_conn.commit()
+                except Exception as e:
+                    raw_conn.rollback()
+                    logger.error(f"Failed during copy operation: {str(e)}")
+                    raise
+                finally:
+                    raw_conn.close()
+
+            inserted = self._merge_readings_staging(staging)
+            logger.info(
+                f"Loaded {inserted} new rows into raw_meter_readings "
+                f"({len(df) - inserted} duplicates skipped)"
             )
-            output.seek(0)
-            
-            # Get raw connection and perform copy
+
+        except Exception as e:
+            logger.error(f"Failed to load raw readings: {str(e)}")
+            raise
+
+    def _prepare_readings_staging(self) -> str:
+        """Create (or reset) the unlogged readings staging table.
+
+        Unlogged means no WAL traffic during the COPY, and the absence of
+        a primary key means the bulk load never trips on duplicates.
+        """
+        staging = 'staging_raw_meter_readings'
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE UNLOGGED TABLE IF NOT EXISTS {self.raw_schema}.{staging} "
+                f"(LIKE {self.raw_schema}.raw_meter_readings INCLUDING DEFAULTS)"
+            ))
+            conn.execute(text(f"TRUNCATE {self.raw_schema}.{staging}"))
+        return staging
+
+    def _merge_readings_staging(self, staging: str) -> int:
+        """Merge staged readings into the target; returns rows inserted.
+
+        The composite PK index dedupes rows previous runs already loaded.
+        """
+        with self.engine.begin() as conn:
+            # An async commit is fine here: a crash before the WAL flush
+            # just means the next run re-merges from staging
+            conn.execute(text("SET LOCAL synchronous_commit = off"))
+            result = conn.execute(text(
+                f"INSERT INTO {self.raw_schema}.raw_meter_readings "
+                f"SELECT * FROM {self.raw_schema}.{staging} "
+                f"ON CONFLICT (meterpoint_id, interval_start) DO NOTHING"
+            ))
+        return result.rowcount
+
+    def load_raw_readings_stream(self, batches) -> int:
+        """
+        Load meter readings from an iterator of Arrow tables.
+
+        Streaming counterpart of load_raw_readings for readings sets too
+        large to materialize as one DataFrame: each batch is COPY'd into
+        the staging table as the parser produces it (see
+        iter_reading_batches in the extraction module), so peak memory
+        stays at one batch, and a single ON CONFLICT merge runs at the end.
+
+        Args:
+            batches: Iterable of Arrow tables with the readings columns
+
+        Returns:
+            Number of new rows merged into raw_meter_readings
+        """
+        try:
+            if 'raw_meter_readings' not in self._tables(self.raw_schema):
+                self.ensure_schema_exists(self.raw_schema)
+                self.ensure_raw_tables_exist()
+
+            staging = self._prepare_readings_staging()
+            columns = ['interval_start', 'consumption_delta', 'meterpoint_id']
+            copy_sql = (
+                f"COPY {self.raw_schema}.{staging} ({','.join(columns)}) "
+                f"FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t')"
+            )
+
+            total = 0
             raw_conn = self.engine.raw_connection()
             try:
                 with raw_conn.cursor() as cur:
-                    # Ensure we're in the correct schema
-                    cur.execute(f"SET search_path TO {self.raw_schema}")
-                    
-                    # Perform the copy operation
-                    cur.copy_from(
-                        output,
-                        'raw_meter_readings',  # Remove schema prefix as we set search_path
-                        columns=['interval_start', 'consumption_delta', 'meterpoint_id', 'loaded_at'],
-                        sep='\t'
-                    )
-                    raw_conn.commit()
-                    logger.info(f"Successfully loaded {len(df)} rows into raw_meter_readings")
+                    cur.execute("SET synchronous_commit = off")
+                    for batch in batches:
+                        buffer = StringIO()
+                        batch.to_pandas()[columns].to_csv(
+                            buffer,
+                            sep='\t',
+                            header=False,
+                            index=False,
+                            date_format='%Y-%m-%d %H:%M:%S'
+                        )
+                        buffer.seek(0)
+                        cur.copy_expert(copy_sql, buffer)
+                        total += len(batch)
+                raw_conn.commit()
             except Exception as e:
                 raw_conn.rollback()
-                logger.error(f"Failed during copy operation: {str(e)}")
+                logger.error(f"Failed during streaming copy: {e}")
                 raise
             finally:
                 raw_conn.close()
-                
+
+            inserted = self._merge_readings_staging(staging)
+            logger.info(
+                f"Streamed {total} rows, merged {inserted} new into "
+                f"raw_meter_readings"
+            )
+            return inserted
+
         except Exception as e:
-            logger.error(f"Failed to load raw readings: {str(e)}")
+            logger.error(f"Failed to stream raw readings: {str(e)}")
             raise
 
-    def load_raw_reference_data(self, table_name: str, df: pd.DataFrame) -> None:
-        """Load reference data (agreements, products, meterpoints) into PostgreSQL."""
+    def copy_dataframe(self, df: pd.DataFrame, table_name: str, schema: str) -> None:
+        """
+        Bulk load a DataFrame into an existing table via COPY FROM STDIN.
+
+        Args:
+            df: DataFrame to load
+            table_name: Target table name
+            schema: Target schema name
+
+        COPY streams the whole frame in a single command instead of issuing
+        one INSERT per row, which is an order of magnitude faster for the
+        analytics tables.
+        """
+        buffer = StringIO()
+        df.to_csv(buffer, index=False, header=False, sep='\t', na_rep='\\N')
+        buffer.seek(0)
+
+        columns = ','.join(df.columns)
+        copy_sql = (
+            f"COPY {schema}.{table_name} ({columns}) "
+            f"FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')"
+        )
+
+        raw_conn = self.engine.raw_connection()
         try:
-            # Ensure schema exists
-            self.ensure_schema_exists(self.raw_schema)
-            
-            # Add loaded_at timestamp
-            df['loaded_at'] = datetime.now()
-            
-            # Use pandas to_sql for smaller reference tables
-            df.to_sql(
+            with raw_conn.cursor() as cur:
+                cur.copy_expert(copy_sql, buffer)
+            raw_conn.commit()
+        except Exception as e:
+            raw_conn.rollback()
+            logger.error(f"Failed COPY into {schema}.{table_name}: {e}")
+            raise
+        finally:
+            raw_conn.close()
+
+    def _replace_table(self, df: pd.DataFrame, table_name: str, schema: str) -> None:
+        """Replace a table's contents via TRUNCATE + COPY in one transaction.
+
+        Truncating instead of dropping keeps the table's DDL (and any
+        grants or future constraints) intact, and putting the TRUNCATE and
+        the COPY on one connection makes the swap atomic.
+        """
+        if table_name not in self._tables(schema):
+            # First load: let pandas create the empty table with matching
+            # column types
+            df.head(0).to_sql(
                 name=table_name,
-                schema=self.raw_schema,
+                schema=schema,
                 con=self.engine,
                 if_exists='replace',
-                index=False
+                index=False,
+                method=psql_insert_copy,
+                chunksize=50_000
             )
-            
+            self._tables(schema).add(table_name)
+
+        buffer = StringIO()
+        df.to_csv(buffer, index=False, header=False, sep='\t', na_rep='\\N')
+        buffer.seek(0)
+        copy_sql = (
+            f"COPY {schema}.{table_name} ({','.join(df.columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')"
+        )
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cur:
+                cur.execute(f'TRUNCATE {schema}.{table_name}')
+                cur.copy_expert(copy_sql, buffer)
+            raw_conn.commit()
+        except Exception as e:
+            raw_conn.rollback()
+            logger.error(f"Failed TRUNCATE+COPY into {schema}.{table_name}: {e}")
+            raise
+        finally:
+            raw_conn.close()
+
+    def binary_copy_readings(self, df: pd.DataFrame,
+                             table_name: str = 'raw_meter_readings') -> None:
+        """
+        Load meter readings via PostgreSQL's binary COPY format.
+
+        Binary COPY avoids formatting the numeric-heavy readings columns as
+        text and parsing them back server-side, roughly halving the work of
+        a CSV COPY.
+
+        Args:
+            df: DataFrame containing meter readings
+            table_name: Target table in the raw schema
+        """
+        columns = ('interval_start', 'consumption_delta', 'meterpoint_id')
+
+        # Coerce to the exact dtypes pgcopy's binary encoders expect;
+        # loaded_at stays server-side via the column DEFAULT
+        payload = df[list(columns)].copy()
+        payload['interval_start'] = payload['interval_start'].astype('datetime64[ns]')
+        payload['consumption_delta'] = payload['consumption_delta'].astype('float64')
+        payload['meterpoint_id'] = payload['meterpoint_id'].astype(str).str.encode('utf-8')
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cur:
+                # Bulk loads are re-runnable; skip the WAL flush wait
+                cur.execute("SET synchronous_commit = off")
+            manager = CopyManager(
+                raw_conn,
+                f'{self.raw_schema}.{table_name}',
+                columns
+            )
+            manager.copy(payload.itertuples(index=False, name=None))
+            raw_conn.commit()
+            logger.info(f"Binary-copied {len(df)} rows into {table_name}")
+        except Exception as e:
+            raw_conn.rollback()
+            logger.error(f"Failed during binary copy operation: {e}")
+            raise
+        finally:
+            raw_conn.close()
+
+    def load_raw_reference_data(self, table_name: str, df: pd.DataFrame) -> None:
+        """Load reference data (agreements, products, meterpoints) into PostgreSQL."""
+        try:
+            # Ensure schema exists
+            self.ensure_schema_exists(self.raw_schema)
+
+            # loaded_at fills from the column's server-side DEFAULT; the
+            # COPY lists only the DataFrame's columns
+            self._replace_table(df, table_name, self.raw_schema)
+
             logger.info(f"Loaded {len(df)} rows into {table_name}")
-            
+
         except Exception as e:
             logger.error(f"Failed to load {table_name}: {e}")
             raise
@@ -285,88 +663,283 @@ class PostgresWriter:
         
         # Add metadata columns
         df['reference_date'] = pd.to_datetime(reference_date)
-        df['loaded_at'] = datetime.now()
-        
-        df.to_sql(
-            name=table_name,
-            schema=self.analytics_schema,
-            con=self.engine,
-            if_exists='replace',
-            index=False
-        )
+        df['loaded_at'] = np.datetime64(datetime.now(), 'ns')
+
+        self._replace_table(df, table_name, self.analytics_schema)
         logger.info(f"Wrote {len(df)} rows to {self.analytics_schema}.{table_name}")
-    
+
     def write_halfhourly_consumption(self, df: pd.DataFrame) -> None:
         """
         Write half-hourly consumption data to PostgreSQL.
-        
+
         Args:
             df: DataFrame containing half-hourly consumption data
         """
         table_name = 'halfhourly_consumption'
-        
+
         # Add metadata column
-        df['loaded_at'] = datetime.now()
-        
-        df.to_sql(
-            name=table_name,
-            schema=self.analytics_schema,
-            con=self.engine,
-            if_exists='replace',
-            index=False
-        )
+        df['loaded_at'] = np.datetime64(datetime.now(), 'ns')
+
+        self._replace_table(df, table_name, self.analytics_schema)
         logger.info(f"Wrote {len(df)} rows to {self.analytics_schema}.{table_name}")
-    
+
     def write_daily_product_consumption(self, df: pd.DataFrame) -> None:
         """
         Write daily product consumption data to PostgreSQL.
-        
+
         Args:
             df: DataFrame containing daily product consumption data
         """
         table_name = 'daily_product_consumption'
-        
+
         # Add metadata column
-        df['loaded_at'] = datetime.now()
-        
-        df.to_sql(
-            name=table_name,
-            schema=self.analytics_schema,
-            con=self.engine,
-            if_exists='replace',
-            index=False
-        )
+        df['loaded_at'] = np.datetime64(datetime.now(), 'ns')
+
+        self._replace_table(df, table_name, self.analytics_schema)
         logger.info(f"Wrote {len(df)} rows to {self.analytics_schema}.{table_name}")
     
-    def get_table_info(self, schema: Optional[str] = None) -> Dict:
+    def write_all(self, df_active_agreements: pd.DataFrame, df_halfhourly: pd.DataFrame,
+                  df_product_daily: pd.DataFrame, reference_date: str) -> None:
+        """
+        Write all three analytics tables and swap them in atomically.
+
+        Rows are COPY'd into UNLOGGED staging tables (no WAL traffic during
+        the load) on parallel connections, then one short transaction sets
+        them logged and renames them over the targets — readers never
+        observe a half-written table and a failure mid-load leaves the
+        previous tables intact.
+
+        Args:
+            df_active_agreements: Active agreements frame
+            df_halfhourly: Half-hourly consumption frame
+            df_product_daily: Daily product consumption frame
+            reference_date: The reference date for active agreements
+        """
+        df_active_agreements['reference_date'] = pd.to_datetime(reference_date)
+
+        loaded_at = np.datetime64(datetime.now(), 'ns')
+        frames = {
+            'active_agreements': df_active_agreements,
+            'halfhourly_consumption': df_halfhourly,
+            'daily_product_consumption': df_product_daily
+        }
+
+        self.ensure_schema_exists(self.analytics_schema)
+        schema = self.analytics_schema
+
+        for df in frames.values():
+            df['loaded_at'] = loaded_at
+
+        # The three staging loads are independent and spend their time in
+        # libpq/COPY, so they run on separate pooled connections in
+        # parallel; only the cheap swap below needs a shared transaction
+        with ThreadPoolExecutor(max_workers=len(frames)) as executor:
+            list(executor.map(
+                lambda item: self._load_staging(item[0], item[1], schema),
+                frames.items()
+            ))
+
+        # Atomic swap: all three renames commit together, so readers see
+        # either the previous load or the new one
+        with self.engine.begin() as conn:
+            for table_name in frames:
+                staging = f'{table_name}_new'
+                conn.execute(text(f'DROP TABLE IF EXISTS {schema}.{table_name}'))
+                conn.execute(text(f'ALTER TABLE {schema}.{staging} SET LOGGED'))
+                conn.execute(text(
+                    f'ALTER TABLE {schema}.{staging} RENAME TO {table_name}'
+                ))
+                self._tables(schema).add(table_name)
+
+        logger.info(
+            f"Atomically wrote {', '.join(frames)} to {schema} "
+            f"({sum(len(df) for df in frames.values())} rows)"
+        )
+
+    def _load_staging(self, table_name: str, df: pd.DataFrame, schema: str) -> None:
+        """Create and fill an unlogged staging table on its own connection."""
+        staging = f'{table_name}_new'
+        with self.engine.begin() as conn:
+            conn.execute(text(f'DROP TABLE IF EXISTS {schema}.{staging}'))
+            df.head(0).to_sql(staging, conn, schema=schema,
+                              if_exists='replace', index=False,
+                              method=psql_insert_copy, chunksize=50_000)
+            conn.execute(text(f'ALTER TABLE {schema}.{staging} SET UNLOGGED'))
+
+            buffer = StringIO()
+            df.to_csv(buffer, index=False, header=False, sep='\t', na_rep='\\N')
+            buffer.seek(0)
+            copy_sql = (
+                f"COPY {schema}.{staging} ({','.join(df.columns)}) "
+                f"FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')"
+            )
+            with conn.connection.cursor() as cur:
+                cur.copy_expert(copy_sql, buffer)
+
+    # Views materializing the analytics transforms in SQL, so Postgres can
+    # evaluate the joins/aggregations itself instead of round-tripping the
+    # raw tables through pandas
+    ANALYTICS_VIEWS = ('active_agreements', 'halfhourly_consumption', 'daily_product_consumption')
+
+    def create_analytics_views(self, reference_date: str = '2021-01-01') -> None:
+        """
+        Create the analytics materialized views if they don't exist.
+
+        Args:
+            reference_date: Reference date baked into the active_agreements view
+        """
+        view_sql = {
+            'active_agreements': f"""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS {self.analytics_schema}.active_agreements AS
+                SELECT a.agreement_id,
+                       a.meterpoint_id,
+                       p.display_name,
+                       p.is_variable
+                FROM {self.raw_schema}.raw_agreements a
+                LEFT JOIN {self.raw_schema}.raw_products p
+                       ON a.product_id = p.product_id
+                WHERE a.agreement_valid_from <= DATE '{reference_date}'
+                  AND (a.agreement_valid_to IS NULL
+                       OR a.agreement_valid_to >= DATE '{reference_date}')
+            """,
+            'halfhourly_consumption': f"""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS {self.analytics_schema}.halfhourly_consumption AS
+                SELECT interval_start AS datetime,
+                       COUNT(DISTINCT meterpoint_id) AS meterpoint_count,
+                       SUM(consumption_delta) AS total_consumption_kwh
+                FROM {self.raw_schema}.raw_meter_readings
+                GROUP BY interval_start
+            """,
+            'daily_product_consumption': f"""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS {self.analytics_schema}.daily_product_consumption AS
+                SELECT p.display_name AS product_display_name,
+                       r.interval_start::date AS date,
+                       COUNT(DISTINCT r.meterpoint_id) AS meterpoint_count,
+                       SUM(r.consumption_delta) AS total_consumption_kwh
+                FROM {self.raw_schema}.raw_meter_readings r
+                JOIN {self.raw_schema}.raw_agreements a
+                  ON a.meterpoint_id = r.meterpoint_id
+                 AND a.agreement_valid_from <= r.interval_start::date
+                 AND (a.agreement_valid_to IS NULL
+                      OR a.agreement_valid_to >= r.interval_start::date)
+                LEFT JOIN {self.raw_schema}.raw_products p
+                       ON a.product_id = p.product_id
+                GROUP BY p.display_name, r.interval_start::date
+            """
+        }
+
+        # REFRESH ... CONCURRENTLY requires a unique index on each view
+        unique_indexes = {
+            'active_agreements': '(agreement_id)',
+            'halfhourly_consumption': '(datetime)',
+            'daily_product_consumption': '(product_display_name, date)'
+        }
+
+        self.ensure_schema_exists(self.analytics_schema)
+        with self.engine.connect() as conn:
+            for view_name in self.ANALYTICS_VIEWS:
+                conn.execute(text(view_sql[view_name]))
+                conn.execute(text(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{view_name}_refresh "
+                    f"ON {self.analytics_schema}.{view_name} {unique_indexes[view_name]}"
+                ))
+            conn.commit()
+        logger.info("Analytics materialized views created or verified")
+
+    def refresh_analytics_views(self) -> None:
+        """Refresh the analytics materialized views from the raw tables."""
+        with self.engine.connect() as conn:
+            for view_name in self.ANALYTICS_VIEWS:
+                conn.execute(text(
+                    f"REFRESH MATERIALIZED VIEW CONCURRENTLY "
+                    f"{self.analytics_schema}.{view_name}"
+                ))
+            conn.commit()
+        logger.info("Analytics materialized views refreshed")
+
+    def export_halfhourly_parquet(self, dataset_root: str = 'data/analytics/halfhourly') -> None:
+        """
+        Export halfhourly_consumption as a day-partitioned Parquet dataset.
+
+        Dashboards can then scan only the partitions a date-range filter
+        touches instead of re-reading the whole fact table from Postgres on
+        every page load.
+
+        Args:
+            dataset_root: Root directory of the hive-partitioned dataset
+                          (one date=YYYY-MM-DD directory per day)
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet export")
+
+        df = pd.read_sql_query(
+            f"SELECT datetime, meterpoint_count, total_consumption_kwh "
+            f"FROM {self.analytics_schema}.halfhourly_consumption",
+            self.engine
+        )
+        df['date'] = df['datetime'].dt.strftime('%Y-%m-%d')
+
+        pq.write_to_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            root_path=dataset_root,
+            partition_cols=['date'],
+            existing_data_behavior='delete_matching'
+        )
+        logger.info(f"Exported {len(df)} halfhourly rows to {dataset_root}")
+
+    def get_table_info(self, schema: Optional[str] = None,
+                       approximate: bool = False) -> Dict:
         """
         Get information about tables in the specified schema.
-        
+
         Args:
             schema: Database schema to inspect. Defaults to the configured schema.
-        
+            approximate: Use the planner's reltuples estimates instead of
+                         COUNT(*). One catalog lookup, no table scans; row
+                         counts are estimates and last_update is None.
+
         Returns:
             Dictionary containing table information including row counts
         """
         schema = schema or self.analytics_schema
-        inspector = inspect(self.engine)
-        info = {}
-        
-        for table_name in inspector.get_table_names(schema=schema):
-            # Get row count
-            query = text(f"SELECT COUNT(*) FROM {schema}.{table_name}")
+        tables = sorted(self._tables(schema))
+        if not tables:
+            return {}
+
+        if approximate:
+            query = text("""
+                SELECT c.relname AS table_name,
+                       c.reltuples::bigint AS row_count,
+                       NULL AS last_update
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = :schema
+            """)
             with self.engine.connect() as conn:
-                row_count = conn.execute(query).scalar()
-            
-            # Get last update time
-            query = text(f"SELECT MAX(loaded_at) FROM {schema}.{table_name}")
+                rows = [
+                    row for row in conn.execute(query, {'schema': schema})
+                    if row[0] in tables
+                ]
+        else:
+            # One UNION ALL round-trip on one connection replaces a COUNT
+            # and a MAX query (each with its own connection acquire) per
+            # table
+            query = text(' UNION ALL '.join(
+                f"SELECT '{table_name}' AS table_name, COUNT(*) AS row_count, "
+                f"MAX(loaded_at) AS last_update FROM {schema}.{table_name}"
+                for table_name in tables
+            ))
             with self.engine.connect() as conn:
-                last_update = conn.execute(query).scalar()
-            
-            info[table_name] = {
+                rows = conn.execute(query).fetchall()
+
+        return {
+            table_name: {
                 'row_count': row_count,
                 'last_update': last_update,
-                'columns': [col['name'] for col in inspector.get_columns(table_name, schema=schema)]
+                'columns': [
+                    col['name']
+                    for col in self.inspector.get_columns(table_name, schema=schema)
+                ]
             }
-        
-        return info 
\ No newline at end of file
+            for table_name, row_count, last_update in rows
+        } 
\ No newline at end of file
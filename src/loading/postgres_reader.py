@@ -1,8 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 import pandas as pd
-from sqlalchemy.engine import Connection
 from src.utils.logger import setup_logger
 
+try:
+    import connectorx as cx
+except ImportError:  # connectorx is optional; fall back to chunked pandas reads
+    cx = None
+
 logger = setup_logger("postgres_reader")
 
 class PostgresReader:
@@ -14,34 +19,102 @@ class PostgresReader:
         self.analytics_schema = analytics_schema
     
     def read_raw_tables(self) -> Dict[str, pd.DataFrame]:
-        """Read all raw tables from PostgreSQL data warehouse."""
+        """Read all raw tables from PostgreSQL data warehouse.
+
+        The four fetches run on separate pooled connections so the three
+        small reference-table round-trips overlap with the big readings
+        fetch; total latency is the slowest read, not the sum.
+        """
         try:
             logger.info("Reading raw tables from data warehouse...")
-            with self.engine.connect() as conn:
-                return {
-                    'readings': self._read_table(conn, 'raw_meter_readings', self.raw_schema),
-                    'agreement': self._read_table(conn, 'raw_agreements', self.raw_schema),
-                    'product': self._read_table(conn, 'raw_products', self.raw_schema),
-                    'meterpoint': self._read_table(conn, 'raw_meterpoints', self.raw_schema)
-                }
+            return self._read_tables({
+                'readings': 'raw_meter_readings',
+                'agreement': 'raw_agreements',
+                'product': 'raw_products',
+                'meterpoint': 'raw_meterpoints',
+            }, self.raw_schema)
         except Exception as e:
             logger.error(f"Failed to read raw tables: {e}", exc_info=True)
             raise
-    
+
+    def read_raw_reference_tables(self) -> Dict[str, pd.DataFrame]:
+        """Read just the three raw reference tables.
+
+        Split out so the overlapped pipeline mode can start on these as
+        soon as they're committed, while the readings load still runs.
+        """
+        return self._read_tables({
+            'agreement': 'raw_agreements',
+            'product': 'raw_products',
+            'meterpoint': 'raw_meterpoints',
+        }, self.raw_schema)
+
+    def read_raw_readings(self) -> pd.DataFrame:
+        """Read only the raw meter readings table."""
+        return self._read_table('raw_meter_readings', self.raw_schema)
+
     def read_analytics_tables(self) -> Dict[str, pd.DataFrame]:
         """Read transformed tables from analytics schema."""
         try:
             logger.info("Reading analytics tables from data warehouse...")
-            with self.engine.connect() as conn:
-                return {
-                    'active_agreements': self._read_table(conn, 'active_agreements', self.analytics_schema),
-                    'halfhourly_consumption': self._read_table(conn, 'halfhourly_consumption', self.analytics_schema),
-                    'daily_product_consumption': self._read_table(conn, 'daily_product_consumption', self.analytics_schema)
-                }
+            return self._read_tables({
+                'active_agreements': 'active_agreements',
+                'halfhourly_consumption': 'halfhourly_consumption',
+                'daily_product_consumption': 'daily_product_consumption',
+            }, self.analytics_schema)
         except Exception as e:
             logger.error(f"Failed to read analytics tables: {e}", exc_info=True)
             raise
+
+    def _read_tables(self, tables: Dict[str, str], schema: str) -> Dict[str, pd.DataFrame]:
+        """Fetch several tables concurrently, preserving dict order."""
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            frames = executor.map(
+                lambda table_name: self._read_table(table_name, schema),
+                tables.values()
+            )
+            return dict(zip(tables.keys(), frames))
     
-    def _read_table(self, conn: Connection, table_name: str, schema: str) -> pd.DataFrame:
-        """Read a single table from PostgreSQL."""
-        return pd.read_sql_table(table_name, conn, schema=schema) 
\ No newline at end of file
+    @property
+    def _uri(self) -> str:
+        """Connection URI for drivers that bypass SQLAlchemy."""
+        return self.engine.url.render_as_string(hide_password=False)
+
+    def _read_table(self, table_name: str, schema: str) -> pd.DataFrame:
+        """Read a single table from PostgreSQL on its own connection."""
+        # connectorx fetches over binary COPY straight into columnar
+        # buffers, skipping SQLAlchemy's per-row Python tuples
+        if cx is not None:
+            df = cx.read_sql(
+                self._uri,
+                f'SELECT * FROM {schema}.{table_name}',
+                return_type='pandas'
+            )
+            return self._compact(df)
+
+        # Fallback: chunked fetch bounds the row-tuple stage to one chunk
+        with self.engine.connect() as conn:
+            chunks = list(
+                pd.read_sql_table(table_name, conn, schema=schema, chunksize=200_000)
+            )
+        if not chunks:
+            return pd.DataFrame()
+        return self._compact(pd.concat(chunks, ignore_index=True))
+
+    @staticmethod
+    def _compact(df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink a freshly read table before handing it to the transform.
+
+        Low-cardinality object columns (ids, names, regions) become
+        category dtype — int codes plus one copy of each distinct string
+        instead of per-row Python objects — and the consumption measure
+        drops to float32.
+        """
+        if len(df) == 0:
+            return df
+        for column in df.columns[df.dtypes == object]:
+            if df[column].nunique() / len(df) < 0.05:
+                df[column] = df[column].astype('category')
+        if 'consumption_delta' in df.columns:
+            df['consumption_delta'] = df['consumption_delta'].astype('float32')
+        return df 
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Numba-accelerated aggregation kernels for the transformers.
+
+The half-hourly aggregation spends most of its time in per-group
+distinct counting, where pandas allocates a Python set per group. The
+kernel here runs the same reduction over plain int/float arrays, one
+parallel iteration per timestamp group, with a byte-flag array instead
+of a hash set. Everything is optional: without numba the transformers
+stay on their pandas paths.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the pandas paths remain
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _grouped_sum_nunique(codes, values, offsets, n_codes, counts, sums):
+        # One iteration per timestamp group; groups are contiguous slices
+        # of the sorted arrays, so each runs independently in parallel.
+        # The seen-set is a bitset — one bit per meterpoint code — so the
+        # per-group scratch is n_codes/8 bytes and zeroing it is cheap.
+        n_words = (n_codes + 63) >> 6
+        one = np.uint64(1)
+        for g in prange(len(offsets) - 1):
+            seen = np.zeros(n_words, dtype=np.uint64)
+            distinct = 0
+            total = 0.0
+            for i in range(offsets[g], offsets[g + 1]):
+                code = codes[i]
+                bit = one << np.uint64(code & 63)
+                if seen[code >> 6] & bit == 0:
+                    seen[code >> 6] |= bit
+                    distinct += 1
+                total += values[i]
+            counts[g] = distinct
+            sums[g] = total
+
+
+def halfhourly_consumption(
+    timestamps: np.ndarray,
+    meterpoint_codes: np.ndarray,
+    consumption: np.ndarray,
+    n_codes: int,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Aggregate consumption per timestamp over flat arrays.
+
+    Args:
+        timestamps: int64/datetime64 reading timestamps, any order
+        meterpoint_codes: factorized meterpoint ids aligned with timestamps
+        consumption: consumption deltas aligned with timestamps
+        n_codes: number of distinct meterpoint codes
+
+    Returns:
+        (unique timestamps, distinct-meterpoint counts, consumption sums),
+        each ordered by timestamp, or None when numba is unavailable
+    """
+    if njit is None:
+        return None
+
+    # Sort once so each group is a contiguous slice addressed by offsets
+    order = np.argsort(timestamps, kind='stable')
+    unique_ts, starts = np.unique(timestamps[order], return_index=True)
+    offsets = np.append(starts, len(timestamps))
+
+    counts = np.empty(len(unique_ts), dtype=np.int64)
+    sums = np.empty(len(unique_ts), dtype=np.float64)
+    _grouped_sum_nunique(
+        meterpoint_codes[order].astype(np.int64),
+        consumption[order].astype(np.float64),
+        offsets,
+        n_codes,
+        counts,
+        sums,
+    )
+    return unique_ts, counts, sums
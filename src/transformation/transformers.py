@@ -2,9 +2,34 @@
 Module for transforming data into analytics tables.
 """
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
-from typing import Union
+from typing import Optional, Union
+
+from src.transformation._kernels import halfhourly_consumption
+
+try:
+    import numexpr
+except ImportError:  # numexpr is optional; the numpy masks remain
+    numexpr = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; inputs then must be DataFrames
+    pa = None
+
+
+def _as_dataframe(data: Union[pd.DataFrame, 'pa.Table']) -> pd.DataFrame:
+    """Accept Arrow tables alongside DataFrames.
+
+    Readers that fetch over Arrow (connectorx, the batch loader) can hand
+    their tables straight in; the ArrowDtype conversion keeps the columns
+    backed by the existing Arrow buffers instead of copying to numpy.
+    """
+    if pa is not None and isinstance(data, pa.Table):
+        return data.to_pandas(types_mapper=pd.ArrowDtype)
+    return data
 
 class DataTransformer:
     """Class to transform raw data into analytics tables."""
@@ -15,18 +40,102 @@ class DataTransformer:
         Initialize transformer with required dataframes.
         
         Args:
-            df_readings: DataFrame containing meter readings
-            df_agreement: DataFrame containing agreement information
-            df_product: DataFrame containing product information
-            df_meterpoint: DataFrame containing meterpoint information
+            df_readings: DataFrame (or Arrow table) containing meter readings
+            df_agreement: DataFrame (or Arrow table) containing agreement information
+            df_product: DataFrame (or Arrow table) containing product information
+            df_meterpoint: DataFrame (or Arrow table) containing meterpoint information
         """
-        self.df_readings = df_readings
-        self.df_agreement = df_agreement
-        self.df_product = df_product
-        self.df_meterpoint = df_meterpoint
+        self.df_readings = _as_dataframe(df_readings)
+        self.df_agreement = _as_dataframe(df_agreement)
+        self.df_product = _as_dataframe(df_product)
+        self.df_meterpoint = _as_dataframe(df_meterpoint)
         
-        # Ensure datetime type for readings
-        self.df_readings['interval_start'] = pd.to_datetime(self.df_readings['interval_start'])
+        # Parse timestamps only when the loader hasn't already: the readings
+        # usually arrive as datetime64, and the re-parse was a full
+        # string-to-datetime pass mutating the caller's frame. The explicit
+        # format keeps pandas on the C parser when parsing is needed.
+        interval_start = self.df_readings['interval_start']
+        converted = False
+        if not pd.api.types.is_datetime64_any_dtype(interval_start):
+            interval_start = pd.to_datetime(
+                interval_start, format='%Y-%m-%d %H:%M:%S', cache=True
+            )
+            converted = True
+        if not isinstance(interval_start.dtype, np.dtype):
+            # Arrow-backed timestamps pass through to_datetime untouched
+            # but break the int64 views and day truncation below; land
+            # them on numpy datetime64 once here
+            interval_start = interval_start.astype('datetime64[ns]')
+            converted = True
+        if converted:
+            self.df_readings = self.df_readings.assign(
+                interval_start=interval_start
+            )
+
+        # Normalize agreement validity bounds once so date comparisons stay
+        # vectorized datetime64 ops instead of per-row object comparisons;
+        # the astype also moves Arrow-backed columns onto numpy, which the
+        # searchsorted bound and merge_asof require
+        self.df_agreement['agreement_valid_from'] = pd.to_datetime(
+            self.df_agreement['agreement_valid_from']
+        ).astype('datetime64[ns]')
+        self.df_agreement['agreement_valid_to'] = pd.to_datetime(
+            self.df_agreement['agreement_valid_to']
+        ).astype('datetime64[ns]')
+
+        # merge_asof in the daily transform requires the right side ordered
+        # on its join key
+        self.df_agreement = self.df_agreement.sort_values(
+            'agreement_valid_from', ignore_index=True
+        )
+
+        # Dictionary-encode the meterpoint join key with a shared category
+        # set on both sides: merges then compare int codes, not strings.
+        # The union keeps agreements for meterpoints without readings.
+        self.df_readings['meterpoint_id'] = self.df_readings['meterpoint_id'].astype('category')
+        categories = self.df_readings['meterpoint_id'].cat.categories.union(
+            pd.Index(self.df_agreement['meterpoint_id'].unique())
+        )
+        self.df_readings['meterpoint_id'] = (
+            self.df_readings['meterpoint_id'].cat.set_categories(categories)
+        )
+        self.df_agreement['meterpoint_id'] = pd.Categorical(
+            self.df_agreement['meterpoint_id'], categories=categories
+        )
+        self.df_product['display_name'] = self.df_product['display_name'].astype('category')
+
+        # Index the product attributes once: joins against an index are a
+        # hash-free lookup, and every transform needs this same mapping
+        self._product_lookup = self.df_product.set_index('product_id')[
+            ['display_name', 'is_variable']
+        ]
+        self._reading_day_cache: Optional[np.ndarray] = None
+
+        # df_agreement is sorted by agreement_valid_from above, so the
+        # int64 view of that column supports a binary-search lower bound
+        # per reference date; repeated queries (backfills) also memoize
+        # their final frames
+        self._agreement_from_i64 = (
+            self.df_agreement['agreement_valid_from'].values
+            .astype('datetime64[ns]').view('i8')
+        )
+        self._active_cache: dict = {}
+
+    @property
+    def _reading_day(self) -> np.ndarray:
+        """Per-reading day as datetime64[ns], truncated once and reused.
+
+        The int64 reinterpret through datetime64[D] avoids boxing a Python
+        date per row, and caching means repeated transform calls don't
+        re-truncate the full readings column.
+        """
+        if self._reading_day_cache is None:
+            self._reading_day_cache = (
+                self.df_readings['interval_start'].values
+                .astype('datetime64[D]')
+                .astype('datetime64[ns]')
+            )
+        return self._reading_day_cache
         
     def get_active_agreements(self, reference_date: Union[str, date, datetime] = '2021-01-01') -> pd.DataFrame:
         """
@@ -52,23 +161,44 @@ class DataTransformer:
             reference_date = reference_date.strftime('%Y-%m-%d')
         elif not isinstance(reference_date, str):
             raise ValueError("reference_date must be a string ('YYYY-MM-DD'), date, or datetime object")
-        
-        # Filter for active agreements
-        active_agreements = self.df_agreement[
-            (self.df_agreement['agreement_valid_from'] <= reference_date) &
-            (
-                (self.df_agreement['agreement_valid_to'].isna()) |
-                (self.df_agreement['agreement_valid_to'] >= reference_date)
+
+        # Backfills query many reference dates against the same fixed
+        # agreement table; the shallow copy keeps callers that add
+        # columns from touching the cached frame
+        cached = self._active_cache.get(reference_date)
+        if cached is not None:
+            return cached.copy(deep=False)
+
+        # Lower bound by binary search: agreements starting after the
+        # reference date fall out in O(log N) against the sorted
+        # valid_from array instead of a full-column compare
+        # as_unit('ns') before the view: a bare Timestamp from a date
+        # string carries second resolution, whose i8 would compare
+        # seconds against the nanosecond valid_from array
+        ref_ns = pd.Timestamp(reference_date).as_unit('ns').to_datetime64()
+        lo = np.searchsorted(self._agreement_from_i64, ref_ns.view('i8'), side='right')
+        candidates = self.df_agreement.iloc[:lo]
+
+        # Filter out expired agreements; NaT marks open-ended ones. On
+        # large candidate sets numexpr fuses the predicate into one scan
+        # with no intermediate boolean arrays (x != x is its NaT test);
+        # below the cutoff its dispatch overhead outweighs that.
+        if numexpr is not None and len(candidates) > 50_000:
+            active = candidates.query(
+                'agreement_valid_to != agreement_valid_to '
+                'or agreement_valid_to >= @ref_ns',
+                engine='numexpr'
             )
-        ]
-        
-        # Merge with product information
-        result = active_agreements.merge(
-            self.df_product[['product_id', 'display_name', 'is_variable']],
-            on='product_id',
-            how='left'
-        )
-        
+        else:
+            valid_to = candidates['agreement_valid_to'].values.astype('datetime64[D]')
+            ref_day = np.datetime64(reference_date, 'D')
+            active = candidates.loc[np.isnat(valid_to) | (valid_to >= ref_day)]
+
+        # Join product attributes via the prebuilt index: one indexed
+        # lookup on the filtered rows instead of a hash merge that
+        # re-materializes the whole agreement selection
+        result = active.join(self._product_lookup, on='product_id')
+
         # Select and rename columns
         final_columns = [
             'agreement_id',
@@ -76,8 +206,17 @@ class DataTransformer:
             'display_name',
             'is_variable'
         ]
-        
-        return result[final_columns].sort_values('agreement_id')
+
+        result = result[final_columns]
+        ids = result['agreement_id'].values
+        if ids.dtype.kind in 'iu':
+            # argsort on the int ids skips sort_values' block realignment
+            # machinery; take() gathers all columns in one pass
+            result = result.take(np.argsort(ids, kind='stable'))
+        else:
+            result = result.sort_values('agreement_id')
+        self._active_cache[reference_date] = result
+        return result.copy(deep=False)
     
     def get_halfhourly_consumption(self) -> pd.DataFrame:
         """
@@ -86,20 +225,40 @@ class DataTransformer:
         Returns:
             DataFrame with one row per half hour including consumption metrics
         """
-        # Group by interval_start
-        result = self.df_readings.groupby('interval_start').agg({
-            'meterpoint_id': 'nunique',
-            'consumption_delta': 'sum'
-        }).reset_index()
-        
-        # Rename columns
-        result.columns = [
-            'datetime',
-            'meterpoint_count',
-            'total_consumption_kwh'
-        ]
-        
-        return result.sort_values('datetime')
+        # Factorize meterpoint ids first: nunique over int codes uses one
+        # hash table of integers, where nunique over strings builds a
+        # Python set of them per group
+        codes, uniques = pd.factorize(self.df_readings['meterpoint_id'])
+        timestamps = self.df_readings['interval_start'].values
+        consumption = self.df_readings['consumption_delta'].values
+
+        # Prefer the numba kernel: the whole sum + distinct-count reduction
+        # runs as compiled loops over the flat arrays, parallel per group
+        aggregated = halfhourly_consumption(
+            timestamps, codes, consumption, len(uniques)
+        )
+        if aggregated is not None:
+            unique_ts, counts, sums = aggregated
+            return pd.DataFrame({
+                'datetime': unique_ts,
+                'meterpoint_count': counts,
+                'total_consumption_kwh': sums,
+            })
+
+        grouped = pd.DataFrame({
+            'datetime': timestamps,
+            'meterpoint_code': codes,
+            'consumption_delta': consumption,
+        })
+        result = grouped.groupby('datetime', sort=False).agg(
+            meterpoint_count=('meterpoint_code', 'nunique'),
+            total_consumption_kwh=('consumption_delta', 'sum')
+        ).reset_index()
+
+        # Sort on the int64 view of the timestamps; cheaper than
+        # sort_values' generic path for the same order
+        order = np.argsort(result['datetime'].values.view('i8'), kind='stable')
+        return result.take(order)
     
     def get_daily_product_consumption(self) -> pd.DataFrame:
         """
@@ -108,45 +267,103 @@ class DataTransformer:
         Returns:
             DataFrame with one row per product-day including consumption metrics
         """
-        # Add date column to readings
-        df_readings_daily = self.df_readings.copy()
-        df_readings_daily['date'] = df_readings_daily['interval_start'].dt.date
-        
-        # Get active agreements for each reading date
-        df_readings_with_agreement = df_readings_daily.merge(
-            self.df_agreement,
-            on='meterpoint_id',
-            how='left'
+        # Aggregate before joining: collapsing the half-hourly readings to
+        # one row per (meterpoint, day) shrinks the join input ~48× while
+        # preserving both final metrics — the daily sum and the per-day
+        # distinct meterpoints
+        daily_readings = (
+            pd.DataFrame({
+                'meterpoint_id': self.df_readings['meterpoint_id'].values,
+                'date': self._reading_day,
+                'consumption_delta': self.df_readings['consumption_delta'].values,
+            })
+            .groupby(['meterpoint_id', 'date'], sort=False, observed=True)
+            .agg(consumption_delta=('consumption_delta', 'sum'))
+            .reset_index()
         )
-        
-        # Filter for valid agreements
-        df_readings_with_agreement = df_readings_with_agreement[
-            (df_readings_with_agreement['agreement_valid_from'] <= df_readings_with_agreement['interval_start'].dt.date) &
-            (
-                (df_readings_with_agreement['agreement_valid_to'].isna()) |
-                (df_readings_with_agreement['agreement_valid_to'] >= df_readings_with_agreement['interval_start'].dt.date)
-            )
-        ]
-        
-        # Add product information
-        df_with_product = df_readings_with_agreement.merge(
-            self.df_product[['product_id', 'display_name']],
-            on='product_id',
-            how='left'
+
+        # Interval join on the daily aggregate: merge_asof pairs each
+        # meterpoint-day with the latest agreement starting on or before
+        # it, never materializing a readings × agreement-history product.
+        # Agreement validity is date-grained, so matching per day instead
+        # of per half hour loses nothing.
+        df_with_agreement = pd.merge_asof(
+            daily_readings.sort_values('date', ignore_index=True),
+            self.df_agreement[
+                ['meterpoint_id', 'product_id',
+                 'agreement_valid_from', 'agreement_valid_to']
+            ],
+            left_on='date',
+            right_on='agreement_valid_from',
+            by='meterpoint_id',
+            direction='backward'
         )
-        
-        # Group by product and date
-        result = df_with_product.groupby(['display_name', 'date']).agg({
-            'meterpoint_id': 'nunique',
-            'consumption_delta': 'sum'
-        }).reset_index()
-        
-        # Rename columns
-        result.columns = [
-            'product_display_name',
-            'date',
-            'meterpoint_count',
-            'total_consumption_kwh'
+
+        # Keep rows whose matched agreement is still valid on the day
+        day = df_with_agreement['date'].values.astype('datetime64[D]')
+        valid_to = df_with_agreement['agreement_valid_to'].values.astype('datetime64[D]')
+        df_with_agreement = df_with_agreement[
+            df_with_agreement['agreement_valid_from'].notna().values
+            & (np.isnat(valid_to) | (valid_to >= day))
         ]
-        
-        return result.sort_values(['date', 'product_display_name']) 
\ No newline at end of file
+
+        # Map product names through the indexed lookup — a Series.map on
+        # the small product table instead of another merge. Categorical
+        # codes double as the integer keys of the reduction below.
+        display = pd.Categorical(
+            df_with_agreement['product_id'].map(
+                self._product_lookup['display_name']
+            )
+        )
+
+        # Final reduction via bincount on a composite (product, day) int
+        # key: one C pass each for the sum and the count, with no
+        # per-group dispatch. Rows are already unique per (meterpoint,
+        # day) from the daily aggregation and carry exactly one matched
+        # agreement, so distinct meterpoints per key is plain row count.
+        product_codes = display.codes.astype(np.int64)
+        day_i64 = df_with_agreement['date'].values.astype('datetime64[D]').astype(np.int64)
+
+        # Mirror groupby's NaN-key dropping for unmapped products
+        known = product_codes >= 0
+        if not known.all():
+            product_codes = product_codes[known]
+            day_i64 = day_i64[known]
+        if len(day_i64) == 0:
+            return pd.DataFrame(columns=[
+                'product_display_name', 'date',
+                'meterpoint_count', 'total_consumption_kwh'
+            ])
+
+        min_day = day_i64.min()
+        n_days = int(day_i64.max() - min_day) + 1
+        key = product_codes * n_days + (day_i64 - min_day)
+        n_keys = len(display.categories) * n_days
+
+        counts = np.bincount(key, minlength=n_keys)
+        sums = np.bincount(
+            key,
+            weights=df_with_agreement['consumption_delta'].values[known],
+            minlength=n_keys
+        )
+
+        occupied = np.flatnonzero(counts)
+
+        # Emit in (date, product) order by argsorting a transposed
+        # composite key — category codes follow the categories'
+        # lexicographic order, so this matches the name sort
+        order = np.argsort(
+            (occupied % n_days) * len(display.categories) + occupied // n_days,
+            kind='stable'
+        )
+        occupied = occupied[order]
+
+        return pd.DataFrame({
+            'product_display_name': pd.Categorical.from_codes(
+                occupied // n_days, categories=display.categories
+            ),
+            'date': (min_day + occupied % n_days)
+                    .astype('datetime64[D]').astype('datetime64[ns]'),
+            'meterpoint_count': counts[occupied],
+            'total_consumption_kwh': sums[occupied],
+        }) 
\ No newline at end of file
@@ -3,27 +3,36 @@ Logging configuration for the ETL pipeline.
 """
 
 import logging
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from datetime import datetime
 
 def setup_logger(name: str) -> logging.Logger:
     """
     Set up a logger with file and console handlers.
-    
+
+    Idempotent: calling it again with the same name returns the already
+    configured logger instead of attaching duplicate handlers, which
+    multiplied every record (and opened a new log file) per call.
+
     Args:
         name: Name of the logger
-        
+
     Returns:
         Configured logger instance
     """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
     # Create logs directory if it doesn't exist
     log_dir = Path('logs')
     log_dir.mkdir(exist_ok=True)
-    
-    # Create logger
-    logger = logging.getLogger(name)
+
     logger.setLevel(logging.INFO)
-    
+    # Records stop here; propagating to the root logger would double
+    # console output once anything else configures root
+    logger.propagate = False
+
     # Create formatters
     file_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -31,22 +40,24 @@ def setup_logger(name: str) -> logging.Logger:
     console_formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     )
-    
-    # File handler - with timestamp in filename
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_handler = logging.FileHandler(
-        f'logs/etl_{timestamp}.log'
+
+    # One rotated file instead of a new timestamped file per process:
+    # bounded disk use and no descriptor churn across runs
+    file_handler = RotatingFileHandler(
+        log_dir / 'etl.log',
+        maxBytes=50_000_000,
+        backupCount=5
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(file_formatter)
-    
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
-    
+
     # Add handlers to logger
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
-    
-    return logger 
\ No newline at end of file
+
+    return logger